@@ -0,0 +1,185 @@
+"""Hyperparameter search for the complaint classifier.
+
+Evaluates a grid (or random subset) of TF-IDF and LogisticRegression settings
+with stratified CV folds, in parallel across cores:
+1. Featurize: fit each distinct vectorizer config once per fold and cache the
+   (X_train, X_val) matrices.
+2. Classify: every classifier config reuses the cached matrices for its
+   featurization instead of refitting the vectorizer.
+3. Report: mean/std CV accuracy, single-complaint latency (fast scorer, measured
+   serially so workers don't skew timings) and deployable artifact size
+   (FastComplaintScorer npz + json). Configs on the accuracy/latency/size Pareto
+   front are listed first (fastest first), then the dominated ones by accuracy,
+   so the fastest model meeting an accuracy bar can be picked.
+"""
+from __future__ import annotations
+import itertools
+import random
+import tempfile
+from pathlib import Path
+import numpy as np
+from joblib import Parallel, delayed
+from sklearn.model_selection import StratifiedKFold
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+
+from complaint_scorer import FastComplaintScorer, time_per_call
+
+VECTORIZER_GRID = {
+    "max_features": [2000, 5000, 10000],
+    "ngram_range": [(1, 1), (1, 2)],
+    "min_df": [1, 2],
+}
+CLASSIFIER_GRID = {
+    "C": [0.5, 1.0, 2.0, 4.0],
+    "class_weight": [None, "balanced"],
+    "max_iter": [1000],
+}
+
+
+def expand_grid(grid):
+    keys = sorted(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*(grid[k] for k in keys))]
+
+
+def _config_key(config):
+    return tuple(sorted(config.items()))
+
+
+def _featurize(vec_config, texts, train_idx, val_idx, keep_model):
+    """Fit one vectorizer on a fold; the fitted object is only shipped back when keep_model."""
+    vectorizer = TfidfVectorizer(stop_words="english", **vec_config)
+    X_train = vectorizer.fit_transform(texts[train_idx])
+    X_val = vectorizer.transform(texts[val_idx])
+    if not keep_model:
+        return None, X_train, X_val
+    if getattr(vectorizer, "stop_words_", None) is not None:
+        # Older sklearn keeps every pruned term here; only needed for pickling diagnostics
+        vectorizer.stop_words_ = None
+    return vectorizer, X_train, X_val
+
+
+def _fit_score(clf_config, X_train, y_train, X_val, y_val, keep_model):
+    clf = LogisticRegression(**clf_config)
+    clf.fit(X_train, y_train)
+    return float(np.mean(clf.predict(X_val) == y_val)), clf if keep_model else None
+
+
+def artifact_bytes(scorer):
+    """Size on disk of the deployable scorer (vocabulary, idf, coef, intercept)."""
+    with tempfile.TemporaryDirectory() as tmp:
+        scorer.save(Path(tmp) / "scorer")
+        return sum(f.stat().st_size for f in Path(tmp).iterdir())
+
+
+def _dominates(a, b):
+    no_worse = (a["cv_accuracy"] >= b["cv_accuracy"] and a["latency_us"] <= b["latency_us"]
+                and a["model_bytes"] <= b["model_bytes"])
+    better = (a["cv_accuracy"] > b["cv_accuracy"] or a["latency_us"] < b["latency_us"]
+              or a["model_bytes"] < b["model_bytes"])
+    return no_worse and better
+
+
+def mark_pareto(results):
+    """Flag results not dominated on (accuracy up, latency down, size down)."""
+    for r in results:
+        r["pareto"] = not any(_dominates(o, r) for o in results if o is not r)
+    return results
+
+
+def rank_results(results):
+    """Pareto front first (fastest, then smallest), then dominated rows by accuracy, latency, size."""
+    mark_pareto(results)
+    results.sort(key=lambda r: (not r["pareto"],
+                                0.0 if r["pareto"] else -r["cv_accuracy"],
+                                r["latency_us"], r["model_bytes"]))
+    return results
+
+
+def run_search(texts, y, label_encoder, mode="grid", n_iter=10, n_splits=5,
+               n_jobs=-1, latency_sample=200, random_state=42):
+    """Run the search and return result rows, Pareto front first (fastest first).
+
+    texts: cleaned complaint texts; y: encoded labels.
+    mode: "grid" evaluates every combination, "random" samples n_iter of them.
+    """
+    texts = np.asarray(texts, dtype=object)
+    y = np.asarray(y)
+
+    vec_configs = expand_grid(VECTORIZER_GRID)
+    clf_configs = expand_grid(CLASSIFIER_GRID)
+    pairs = list(itertools.product(vec_configs, clf_configs))
+    if mode == "random":
+        pairs = random.Random(random_state).sample(pairs, min(n_iter, len(pairs)))
+    elif mode != "grid":
+        raise ValueError(f"Unknown search mode: {mode}")
+
+    folds = list(StratifiedKFold(n_splits=n_splits, shuffle=True,
+                                 random_state=random_state).split(texts, y))
+
+    # Stage 1: one vectorizer fit per (featurization config, fold)
+    needed_vecs = {_config_key(v): v for v, _ in pairs}
+    feature_jobs = [(key, f) for key in needed_vecs for f in range(len(folds))]
+    featurized = Parallel(n_jobs=n_jobs)(
+        delayed(_featurize)(needed_vecs[key], texts, folds[f][0], folds[f][1], f == 0)
+        for key, f in feature_jobs
+    )
+    feature_cache = dict(zip(feature_jobs, featurized))
+
+    # Stage 2: classifier configs reuse cached matrices
+    fit_jobs = [(v, c, f) for v, c in pairs for f in range(len(folds))]
+    fitted = Parallel(n_jobs=n_jobs)(
+        delayed(_fit_score)(
+            c,
+            feature_cache[(_config_key(v), f)][1], y[folds[f][0]],
+            feature_cache[(_config_key(v), f)][2], y[folds[f][1]],
+            f == 0,
+        )
+        for v, c, f in fit_jobs
+    )
+
+    # Stage 3: aggregate, then time fold-0 models (the only ones sent back) serially
+    results = []
+    for i, (v, c) in enumerate(pairs):
+        per_fold = fitted[i * len(folds):(i + 1) * len(folds)]
+        scores = [acc for acc, _ in per_fold]
+        bundle = {
+            "vectorizer": feature_cache[(_config_key(v), 0)][0],
+            "classifier": per_fold[0][1],
+            "label_encoder": label_encoder,
+        }
+        sample = texts[folds[0][1]][:latency_sample].tolist()
+        scorer = FastComplaintScorer.from_bundle(bundle)
+        results.append({
+            "vectorizer": v,
+            "classifier": c,
+            "cv_accuracy": float(np.mean(scores)),
+            "cv_std": float(np.std(scores)),
+            "latency_us": time_per_call(scorer.predict_one, sample) * 1e6,
+            "model_bytes": artifact_bytes(scorer),
+            "n_features": scorer.n_features,
+        })
+
+    return rank_results(results)
+
+
+def fastest_meeting(results, min_accuracy):
+    """Fastest (then smallest) config whose CV accuracy meets the bar, or None."""
+    ok = [r for r in results if r["cv_accuracy"] >= min_accuracy]
+    return min(ok, key=lambda r: (r["latency_us"], r["model_bytes"])) if ok else None
+
+
+def print_report(results, min_accuracy=None):
+    print(f"\n{'rank':>4} {'front':>5} {'cv_acc':>7} {'±std':>6} {'lat_us':>8} {'size_kb':>8}  config")
+    for rank, r in enumerate(results, 1):
+        print(f"{rank:>4} {'*' if r['pareto'] else '':>5} {r['cv_accuracy']:>7.4f} {r['cv_std']:>6.4f} {r['latency_us']:>8.1f} "
+              f"{r['model_bytes'] / 1024:>8.1f}  {r['vectorizer']} {r['classifier']}")
+    if min_accuracy is not None:
+        best = fastest_meeting(results, min_accuracy)
+        if best is None:
+            print(f"\nNo configuration reaches cv_accuracy >= {min_accuracy}")
+        else:
+            print(f"\nFastest config with cv_accuracy >= {min_accuracy}: "
+                  f"{best['vectorizer']} {best['classifier']} "
+                  f"({best['cv_accuracy']:.4f}, {best['latency_us']:.1f}us, "
+                  f"{best['model_bytes'] / 1024:.1f}KB)")
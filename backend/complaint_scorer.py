@@ -0,0 +1,203 @@
+"""Lightweight complaint scorer (pure NumPy).
+
+Compiles the trained model bundle from ml_complaint_classifier.py
+({"vectorizer", "classifier", "label_encoder"}) into:
+- a precompiled regex tokenizer: clean_text (shared with the training script) + the TF-IDF analyzer
+  (lowercase, strip urls / non-letters, drop english stop words, unigrams + bigrams)
+- a token/bigram -> (feature id, idf) table
+- a dense (n_features, n_classes) coefficient matrix and intercept vector
+
+Scoring one complaint is then a dict lookup per term, one small gather and a
+dot product, avoiding TfidfVectorizer.transform / CSR construction overhead.
+Results match the sklearn bundle (see test_complaint_scorer.py).
+
+Building a scorer (from_bundle) needs the unpickled sklearn bundle; save() writes
+the compiled scorer as <path>.npz + <path>.json, and load() reads it back with
+NumPy only, so inference does not need sklearn.
+
+Optional prune() keeps only the features with the largest coefficients and
+reports the accuracy cost on a labelled sample.
+"""
+from __future__ import annotations
+import json
+import re
+import time
+from collections import Counter
+import numpy as np
+
+URL_RE = re.compile(r"http\S+|www\S+|https\S+")
+NON_ALPHA_RE = re.compile(r"[^a-z\s]")
+WHITESPACE_RE = re.compile(r"\s+")
+# TfidfVectorizer default token_pattern on already-cleaned text: runs of 2+ letters
+TOKEN_RE = re.compile(r"[a-z]{2,}")
+
+
+def clean_text(text):
+    """Complaint preprocessing used for training (ml_complaint_classifier.py) and scoring."""
+    text = str(text).lower()
+    text = URL_RE.sub("", text)
+    text = NON_ALPHA_RE.sub(" ", text)
+    text = WHITESPACE_RE.sub(" ", text).strip()
+    return text
+
+
+def tokenize(text, stop_words=frozenset()):
+    """clean_text followed by the vectorizer's tokenizer and stop-word filter."""
+    return [t for t in TOKEN_RE.findall(clean_text(text)) if t not in stop_words]
+
+
+class FastComplaintScorer:
+    """Dense-lookup TF-IDF + linear scorer compiled from a sklearn model bundle."""
+
+    def __init__(self, table, coef, intercept, classes, stop_words, ngram_range=(1, 2)):
+        self.table = table                # term -> (feature id, idf)
+        self.coef = coef                  # (n_features, n_classes) float64
+        self.intercept = intercept        # (n_classes,) float64
+        self.classes = classes            # label per class column
+        self.stop_words = stop_words
+        self.ngram_range = ngram_range
+
+    @classmethod
+    def from_bundle(cls, bundle):
+        vectorizer = bundle["vectorizer"]
+        clf = bundle["classifier"]
+        label_encoder = bundle["label_encoder"]
+
+        if vectorizer.sublinear_tf or vectorizer.norm != "l2" or not vectorizer.use_idf:
+            raise ValueError("FastComplaintScorer expects default TF-IDF settings (l2 norm, raw tf, idf)")
+
+        idf = vectorizer.idf_
+        table = {term: (int(j), float(idf[j])) for term, j in vectorizer.vocabulary_.items()}
+
+        coef = np.asarray(clf.coef_, dtype=np.float64)
+        intercept = np.asarray(clf.intercept_, dtype=np.float64)
+        if coef.shape[0] == 1:
+            # Binary LogisticRegression: decision > 0 picks class 1
+            coef = np.vstack([np.zeros_like(coef), coef])
+            intercept = np.concatenate([[0.0], intercept])
+        classes = label_encoder.inverse_transform(clf.classes_)
+
+        stop_words = frozenset(vectorizer.get_stop_words() or ())
+        return cls(table, np.ascontiguousarray(coef.T), intercept, classes,
+                   stop_words, tuple(vectorizer.ngram_range))
+
+    def save(self, path):
+        """Write <path>.npz (coef, intercept, term ids, idf) and <path>.json (terms, classes, stop words)."""
+        path = str(path)
+        terms = list(self.table)
+        np.savez(
+            path + ".npz",
+            coef=self.coef,
+            intercept=self.intercept,
+            ids=np.array([self.table[t][0] for t in terms], dtype=np.int64),
+            idf=np.array([self.table[t][1] for t in terms], dtype=np.float64),
+        )
+        meta = {
+            "terms": terms,
+            "classes": [str(c) for c in self.classes],
+            "stop_words": sorted(self.stop_words),
+            "ngram_range": list(self.ngram_range),
+        }
+        with open(path + ".json", "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+
+    @classmethod
+    def load(cls, path):
+        path = str(path)
+        with open(path + ".json", encoding="utf-8") as f:
+            meta = json.load(f)
+        with np.load(path + ".npz") as arrays:
+            coef = np.ascontiguousarray(arrays["coef"])
+            intercept = arrays["intercept"]
+            ids = arrays["ids"]
+            idf = arrays["idf"]
+        table = {term: (int(j), float(w)) for term, j, w in zip(meta["terms"], ids, idf)}
+        return cls(table, coef, intercept, np.array(meta["classes"], dtype=object),
+                   frozenset(meta["stop_words"]), tuple(meta["ngram_range"]))
+
+    def _terms(self, text):
+        tokens = tokenize(text, self.stop_words)
+        lo, hi = self.ngram_range
+        terms = tokens if lo == 1 else []
+        for n in range(max(lo, 2), hi + 1):
+            terms = terms + [" ".join(tokens[i:i + n]) for i in range(len(tokens) - n + 1)]
+        return terms
+
+    def features(self, text):
+        """Return (feature ids, l2-normalised tf-idf weights) for one complaint."""
+        counts = Counter(t for t in self._terms(text) if t in self.table)
+        if not counts:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.float64)
+        ids = np.empty(len(counts), dtype=np.intp)
+        weights = np.empty(len(counts), dtype=np.float64)
+        for k, (term, tf) in enumerate(counts.items()):
+            j, idf = self.table[term]
+            ids[k] = j
+            weights[k] = tf * idf
+        weights /= np.sqrt(weights @ weights)
+        return ids, weights
+
+    def decision_function(self, text):
+        ids, weights = self.features(text)
+        return weights @ self.coef[ids] + self.intercept
+
+    def predict_one(self, text):
+        return self.classes[int(np.argmax(self.decision_function(text)))]
+
+    def predict(self, texts):
+        return np.array([self.predict_one(t) for t in texts])
+
+    def prune(self, keep):
+        """Keep the `keep` features with the largest max |coef| across classes.
+
+        Returns a new scorer with a compact feature space; evaluate the
+        accuracy cost with accuracy() / prune_report().
+        """
+        importance = np.abs(self.coef).max(axis=1)
+        keep = min(int(keep), len(importance))
+        kept = np.sort(np.argsort(importance)[::-1][:keep])
+        remap = {int(old): new for new, old in enumerate(kept)}
+        table = {term: (remap[j], idf) for term, (j, idf) in self.table.items() if j in remap}
+        return FastComplaintScorer(table, np.ascontiguousarray(self.coef[kept]), self.intercept,
+                                   self.classes, self.stop_words, self.ngram_range)
+
+    def accuracy(self, texts, labels):
+        return float(np.mean(self.predict(texts) == np.asarray(labels)))
+
+    @property
+    def n_features(self):
+        return self.coef.shape[0]
+
+
+def verify_parity(bundle, scorer, texts):
+    """Check the fast scorer against the sklearn bundle; returns mismatch count."""
+    cleaned = [clean_text(t) for t in texts]
+    X = bundle["vectorizer"].transform(cleaned)
+    expected = bundle["label_encoder"].inverse_transform(bundle["classifier"].predict(X))
+    got = scorer.predict(texts)
+    return int(np.sum(expected != got))
+
+
+def prune_report(scorer, texts, labels, keep_sizes):
+    """Accuracy and feature count for each pruning size (baseline first)."""
+    rows = [{"features": scorer.n_features, "accuracy": scorer.accuracy(texts, labels)}]
+    for keep in keep_sizes:
+        if keep >= scorer.n_features:
+            continue
+        pruned = scorer.prune(keep)
+        rows.append({"features": pruned.n_features, "accuracy": pruned.accuracy(texts, labels)})
+    base = rows[0]["accuracy"]
+    for row in rows:
+        row["accuracy_cost"] = base - row["accuracy"]
+    return rows
+
+
+def time_per_call(fn, texts, repeat=3):
+    """Best-of-`repeat` mean seconds per single-text call."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for t in texts:
+            fn(t)
+        best = min(best, (time.perf_counter() - start) / max(len(texts), 1))
+    return best
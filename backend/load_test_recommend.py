@@ -0,0 +1,352 @@
+"""Load-testing harness for recommend_api.py.
+
+Drives the recommender through its real JSON contract
+({"age", "category", "annualIncome", "state"}) and reports throughput,
+p50/p95/p99 latency, error rate and peak RSS.
+
+Peak RSS: spawn reports the largest single request process; stream reports each
+worker's VmHWM (Linux /proc) and their sum; http needs --server-pid, otherwise n/a.
+
+Targets:
+- spawn:  one `python recommend_api.py` process per request (what the Node route does today)
+- stream: a pool of long-lived `recommend_api.py --stream` workers (one JSON line in, one out)
+- http:   POST the profile JSON to a long-lived server URL (--url). No such server exists in
+          this tree yet: the Node /api/schemes route is an authenticated GET that spawns the
+          script per request, so it is not a valid target. The mode is for a future Python server
+          that accepts the same JSON body and returns {"schemes": [...]}.
+
+Load shape:
+- closed loop (default): --concurrency clients issue requests back to back
+- open loop (--rate R): Poisson arrivals at R req/s, at most --concurrency in flight;
+  latency is measured from the scheduled arrival so queueing delay is included
+
+Profiles are sampled (with replacement) from civicconnect_govt_schemes_dataset_large.csv,
+so the request mix follows the dataset's age/category/income/state distribution.
+--stub-encoder sets CIVIC_STUB_ENCODER=1 for spawned workers so runs are fully offline.
+
+Example:
+    python load_test_recommend.py --mode stream --concurrency 4 --requests 500 --stub-encoder
+"""
+from __future__ import annotations
+import argparse
+import csv
+import json
+import os
+import queue
+import random
+import resource
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+DATA_PATH = Path(__file__).resolve().parent / "civicconnect_govt_schemes_dataset_large.csv"
+API_PATH = Path(__file__).resolve().parent / "recommend_api.py"
+
+
+def load_profiles(path=DATA_PATH):
+    """Read (age, category, annualIncome, state) rows from the scheme dataset."""
+    with open(path, newline="", encoding="utf-8") as f:
+        return [
+            {
+                "age": int(row["age"]),
+                "category": row["category"],
+                "annualIncome": int(float(row["annual_income"])),
+                "state": row["state"],
+            }
+            for row in csv.DictReader(f)
+            if row["age"] and row["annual_income"] and row["category"] and row["state"]
+        ]
+
+
+def worker_env(stub_encoder):
+    env = dict(os.environ)
+    if stub_encoder:
+        env["CIVIC_STUB_ENCODER"] = "1"
+    return env
+
+
+def _check_response(body):
+    result = json.loads(body)
+    if "error" in result or "schemes" not in result:
+        raise RuntimeError(result.get("error", "malformed response"))
+    return result
+
+
+def proc_peak_rss_mb(pid):
+    """VmHWM (peak RSS) of a live process from /proc, in MB; nan if unavailable."""
+    try:
+        for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return float("nan")
+
+
+class SpawnTarget:
+    """New interpreter per request, payload on stdin (mirrors app/api/schemes/route.ts)."""
+
+    def __init__(self, python, stub_encoder, timeout):
+        self.cmd = [python, str(API_PATH)]
+        self.env = worker_env(stub_encoder)
+        self.timeout = timeout
+
+    def __call__(self, profile):
+        proc = subprocess.run(self.cmd, input=json.dumps(profile), capture_output=True,
+                              text=True, env=self.env, timeout=self.timeout)
+        if proc.returncode != 0:
+            raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "exit %d" % proc.returncode)
+        _check_response(proc.stdout)
+
+    def peak_rss(self):
+        # Largest single request process; concurrent processes add up on top of this
+        kb = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+        # ru_maxrss is bytes on macOS, kilobytes on Linux
+        return [kb / (1024 * 1024) if sys.platform == "darwin" else kb / 1024]
+
+    def close(self):
+        pass
+
+
+class WorkerExited(RuntimeError):
+    """A stream worker closed its stdout (crashed or exited)."""
+
+
+class StreamWorker:
+    """One `recommend_api.py --stream` process; a reader thread feeds stdout lines to a queue."""
+
+    def __init__(self, cmd, env):
+        self.proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                     text=True, bufsize=1, env=env)
+        self.lines = queue.Queue()
+        threading.Thread(target=self._read, daemon=True).start()
+
+    def _read(self):
+        for line in self.proc.stdout:
+            self.lines.put(line)
+        self.lines.put(None)  # EOF
+
+    def roundtrip(self, profile, timeout):
+        self.proc.stdin.write(json.dumps(profile) + "\n")
+        self.proc.stdin.flush()
+        try:
+            line = self.lines.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError(f"worker {self.proc.pid} gave no response within {timeout}s")
+        if line is None:
+            # EOF can arrive before the process is reapable; poll() may still say None here
+            raise WorkerExited("worker %d exited (code %s)" % (self.proc.pid, self.proc.poll()))
+        _check_response(line)
+
+    def peak_rss(self):
+        return proc_peak_rss_mb(self.proc.pid)
+
+    def kill(self):
+        self.proc.kill()
+        self.proc.wait()
+
+    def close(self):
+        self.proc.stdin.close()
+        self.proc.wait()
+
+
+class StreamTarget:
+    """Pool of long-lived `recommend_api.py --stream` workers, checked out per request.
+
+    A worker that times out or dies is killed and replaced; the request counts as an error.
+    """
+
+    def __init__(self, python, stub_encoder, workers, timeout):
+        self.cmd = [python, str(API_PATH), "--stream"]
+        self.env = worker_env(stub_encoder)
+        self.timeout = timeout
+        self.workers = [StreamWorker(self.cmd, self.env) for _ in range(workers)]
+        self.lock = threading.Lock()
+        self.pool = queue.Queue()
+        for worker in self.workers:
+            self.pool.put(worker)
+
+    def warm_up(self, profile):
+        # Model/embedding load happens at startup; keep it out of the measurements
+        for worker in self.workers:
+            worker.roundtrip(profile, self.timeout)
+
+    def _replace(self, worker):
+        worker.kill()
+        fresh = StreamWorker(self.cmd, self.env)
+        with self.lock:
+            self.workers[self.workers.index(worker)] = fresh
+        return fresh
+
+    def __call__(self, profile):
+        worker = self.pool.get()
+        try:
+            worker.roundtrip(profile, self.timeout)
+        except (TimeoutError, OSError, WorkerExited):
+            # Dead worker, or a late reply the next request would read: start a fresh one.
+            # {"error": ...} payloads (plain RuntimeError) leave the worker usable.
+            worker = self._replace(worker)
+            raise
+        finally:
+            self.pool.put(worker)
+
+    def peak_rss(self):
+        # Read /proc while workers are alive; close() reaps them
+        return [w.peak_rss() for w in self.workers]
+
+    def close(self):
+        for worker in self.workers:
+            worker.close()
+
+
+class HttpTarget:
+    """POST the profile JSON to a long-lived server (none ships in this tree; see module docstring)."""
+
+    def __init__(self, url, timeout, server_pid=None):
+        self.url = url
+        self.timeout = timeout
+        self.server_pid = server_pid
+
+    def __call__(self, profile):
+        req = urllib.request.Request(self.url, data=json.dumps(profile).encode("utf-8"),
+                                     headers={"Content-Type": "application/json"}, method="POST")
+        # urlopen raises HTTPError for 4xx/5xx
+        with urllib.request.urlopen(req, timeout=self.timeout) as resp:
+            _check_response(resp.read().decode("utf-8"))
+
+    def peak_rss(self):
+        # The harness spawned nothing; without a server pid there is nothing to measure
+        return [proc_peak_rss_mb(self.server_pid)] if self.server_pid else None
+
+    def close(self):
+        pass
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return float("nan")
+    k = (len(sorted_values) - 1) * pct / 100
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+def run_load(target, profiles, n_requests, concurrency, rate=None, seed=0):
+    """Issue n_requests against target; returns (latencies_s, errors, wall_s)."""
+    rng = random.Random(seed)
+    batch = [rng.choice(profiles) for _ in range(n_requests)]
+    latencies, errors = [], []
+    lock = threading.Lock()
+
+    def one(profile, start):
+        try:
+            target(profile)
+            ok, err = True, None
+        except Exception as exc:
+            ok, err = False, exc
+        elapsed = time.perf_counter() - start
+        with lock:
+            if ok:
+                latencies.append(elapsed)
+            else:
+                errors.append(repr(err))
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        if rate:
+            # Open loop: Poisson arrivals, latency counted from scheduled arrival
+            next_at = t0
+            for profile in batch:
+                next_at += rng.expovariate(rate)
+                delay = next_at - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                pool.submit(one, profile, next_at)
+        else:
+            # Closed loop: every worker thread keeps one request in flight
+            for profile in batch:
+                pool.submit(lambda p=profile: one(p, time.perf_counter()))
+    wall = time.perf_counter() - t0
+    return latencies, errors, wall
+
+
+def summarize(latencies, errors, wall, rss_per_worker_mb):
+    """rss_per_worker_mb: peak RSS per target process (MB), or None if not measurable."""
+    lat = sorted(latencies)
+    total = len(latencies) + len(errors)
+    return {
+        "requests": total,
+        "throughput_rps": len(latencies) / wall if wall > 0 else 0.0,
+        "p50_ms": percentile(lat, 50) * 1000,
+        "p95_ms": percentile(lat, 95) * 1000,
+        "p99_ms": percentile(lat, 99) * 1000,
+        "error_rate": len(errors) / total if total else 0.0,
+        "peak_rss_mb": sum(rss_per_worker_mb) if rss_per_worker_mb else float("nan"),
+        "peak_rss_per_worker_mb": rss_per_worker_mb,
+        "sample_errors": sorted(set(errors))[:5],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test recommend_api.py")
+    parser.add_argument("--mode", choices=["spawn", "stream", "http"], default="spawn")
+    parser.add_argument("--url", help="server URL for --mode http")
+    parser.add_argument("--server-pid", type=int, help="pid of the http server, for peak RSS (Linux /proc)")
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--rate", type=float, help="open-loop arrival rate (req/s); default closed loop")
+    parser.add_argument("--workers", type=int, help="stream workers (default: --concurrency)")
+    parser.add_argument("--stub-encoder", action="store_true", help="offline deterministic encoder")
+    parser.add_argument("--python", default=sys.executable)
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print the summary as JSON")
+    args = parser.parse_args(argv)
+
+    profiles = load_profiles()
+    if args.mode == "spawn":
+        target = SpawnTarget(args.python, args.stub_encoder, args.timeout)
+    elif args.mode == "stream":
+        target = StreamTarget(args.python, args.stub_encoder, args.workers or args.concurrency,
+                              args.timeout)
+        target.warm_up(profiles[0])
+    else:
+        if not args.url:
+            parser.error("--mode http requires --url")
+        target = HttpTarget(args.url, args.timeout, args.server_pid)
+
+    try:
+        latencies, errors, wall = run_load(target, profiles, args.requests,
+                                           args.concurrency, args.rate, args.seed)
+        rss = target.peak_rss()
+    finally:
+        target.close()
+
+    summary = summarize(latencies, errors, wall, rss)
+    if args.json:
+        print(json.dumps(summary, indent=2))
+        return summary
+
+    print(f"mode={args.mode} concurrency={args.concurrency} "
+          f"rate={args.rate or 'closed-loop'} requests={summary['requests']}")
+    print(f"throughput: {summary['throughput_rps']:.2f} req/s")
+    print(f"latency ms: p50={summary['p50_ms']:.1f} p95={summary['p95_ms']:.1f} p99={summary['p99_ms']:.1f}")
+    print(f"error rate: {summary['error_rate']:.2%}")
+    if rss is None:
+        print("peak RSS:   n/a (pass --server-pid to measure the server)")
+    elif args.mode == "spawn":
+        print(f"peak RSS:   {summary['peak_rss_mb']:.1f} MB per request process")
+    else:
+        per_worker = ", ".join(f"{mb:.1f}" for mb in rss)
+        print(f"peak RSS:   {summary['peak_rss_mb']:.1f} MB total (per process: {per_worker})")
+    for err in summary["sample_errors"]:
+        print("  error:", err)
+    return summary
+
+
+if __name__ == "__main__":
+    main()
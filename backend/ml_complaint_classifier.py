@@ -7,8 +7,11 @@ from sklearn.preprocessing import LabelEncoder
 from sklearn.linear_model import LogisticRegression
 from sklearn.metrics import classification_report, accuracy_score
 import pickle
-import re
 import os
+import sys
+import argparse
+
+from complaint_scorer import clean_text, FastComplaintScorer, verify_parity, prune_report, time_per_call
 
 # ------------------------------
 # 1. FIXED PATHS (IMPORTANT)
@@ -19,6 +22,10 @@ PROJECT_ROOT = os.path.dirname(os.path.dirname(__file__))
 
 DATA_PATH = os.path.join(PROJECT_ROOT, "data", "civicconnect_dataset.csv")
 MODEL_PATH = os.path.join(PROJECT_ROOT, "models", "complaint_classifier.pkl")
+# FastComplaintScorer artifacts (<path>.npz + <path>.json), written next to MODEL_PATH
+SCORER_PATH = os.path.join(PROJECT_ROOT, "models", "complaint_scorer")
+PRUNED_SCORER_PATH = os.path.join(PROJECT_ROOT, "models", "complaint_scorer_pruned")
+PRUNED_FEATURES = 2000
 
 print("Using dataset from:", DATA_PATH)
 print("Saving model to:", MODEL_PATH)
@@ -36,15 +43,7 @@ df = df.dropna(subset=["complaint_text", "issue_type"])
 df["issue_type"] = df["issue_type"].astype(str).str.strip()
 
 
-# 4. Text preprocessing
-def clean_text(text):
-    text = str(text).lower()
-    text = re.sub(r"http\S+|www\S+|https\S+", "", text)
-    text = re.sub(r"[^a-z\s]", " ", text)
-    text = re.sub(r"\s+", " ", text).strip()
-    return text
-
-
+# 4. Text preprocessing (clean_text lives in complaint_scorer so the fast scorer shares it)
 df["cleaned_text"] = df["complaint_text"].apply(clean_text)
 
 
@@ -68,6 +67,31 @@ X_train_text, X_test_text, y_train, y_test = train_test_split(
 )
 
 
+# 6b. Optional hyperparameter search (python ml_complaint_classifier.py --search grid|random)
+arg_parser = argparse.ArgumentParser(description="Train the complaint classifier")
+arg_parser.add_argument("--search", choices=["grid", "random"], help="run CV hyperparameter search instead of training")
+arg_parser.add_argument("--n-iter", type=int, default=10, help="configs sampled in random search")
+arg_parser.add_argument("--folds", type=int, default=5, help="stratified CV folds")
+arg_parser.add_argument("--n-jobs", type=int, default=-1, help="parallel workers (-1 = all cores)")
+arg_parser.add_argument("--min-accuracy", type=float, help="accuracy bar for picking the fastest config")
+args = arg_parser.parse_args()
+if args.n_iter < 1:
+    arg_parser.error("--n-iter must be >= 1")
+if args.folds < 2:
+    arg_parser.error("--folds must be >= 2")
+
+if args.search:
+    from complaint_model_search import run_search, print_report
+
+    # Search on the training split only so section 9's test accuracy stays unbiased
+    search_results = run_search(
+        X_train_text.tolist(), y_train, label_encoder,
+        mode=args.search, n_iter=args.n_iter, n_splits=args.folds, n_jobs=args.n_jobs
+    )
+    print_report(search_results, args.min_accuracy)
+    sys.exit(0)
+
+
 # 7. TF-IDF vectorization
 vectorizer = TfidfVectorizer(
     max_features=5000,
@@ -105,16 +129,36 @@ with open(MODEL_PATH, "wb") as f:
 print("\nModel saved successfully at:", MODEL_PATH)
 
 
-# 11. Prediction helper
+# 11. Lightweight NumPy scorer (parity with the bundle is covered by test_complaint_scorer.py)
+fast_scorer = FastComplaintScorer.from_bundle(MODEL_BUNDLE)
+
+mismatches = verify_parity(MODEL_BUNDLE, fast_scorer, X_test_text.tolist())
+print("\nFast scorer parity mismatches on test set:", mismatches)
+
+single_texts = X_test_text.tolist()[:200]
+sk_latency = time_per_call(
+    lambda t: clf.predict(vectorizer.transform([clean_text(t)])), single_texts
+)
+fast_latency = time_per_call(fast_scorer.predict_one, single_texts)
+print(f"Per-complaint latency: sklearn {sk_latency * 1e6:.1f}us, fast scorer {fast_latency * 1e6:.1f}us")
+
+# Optional vocabulary pruning: accuracy cost per feature budget
+test_labels = label_encoder.inverse_transform(y_test)
+print("\nVocabulary pruning (features -> test accuracy, cost):")
+for row in prune_report(fast_scorer, X_test_text.tolist(), test_labels, [PRUNED_FEATURES, 1000, 500]):
+    print(f"  {row['features']:>5} -> {row['accuracy']:.4f} ({row['accuracy_cost']:+.4f})")
+
+fast_scorer.save(SCORER_PATH)
+fast_scorer.prune(PRUNED_FEATURES).save(PRUNED_SCORER_PATH)
+print("\nFast scorer saved at:", SCORER_PATH, "(pruned:", PRUNED_SCORER_PATH + ")")
+
+
+# 12. Prediction helper (same labels as vectorizer + clf, without the sklearn overhead)
 def predict_issue_type(example_texts):
-    cleaned = [clean_text(t) for t in example_texts]
-    X_vec = vectorizer.transform(cleaned)
-    preds = clf.predict(X_vec)
-    labels = label_encoder.inverse_transform(preds)
-    return labels
+    return fast_scorer.predict(example_texts)
 
 
-# 12. Manual test
+# 13. Manual test
 if __name__ == "__main__":
     sample_complaints = [
         "There is intense water logging in the streets after the rains.",
@@ -15,22 +15,37 @@ Eligibility logic additions:
 - Income ceiling: if scheme marked low_income_flag OR contains housing/ayushman ration keywords and user annual income > scheme income_p95 (if available), exclude.
 - High income users are prevented from receiving low-income targeted schemes.
 
+Modes:
+- default: read one JSON profile from stdin, print one JSON result (spawned per request by Node).
+- --stream: long-lived worker; one JSON profile per stdin line, one JSON result per stdout line.
+- CIVIC_STUB_ENCODER=1 swaps Sentence-BERT for a deterministic offline encoder (load tests); the
+  embedding cache is neither read nor written in that case.
+- CIVIC_PROFILE_RATE>0 profiles that fraction of requests and keeps slow ones (see request_profiler.py).
+
 Note: Heuristics derived from observed dataset distributions; refine with authoritative sources later.
 """
 
+import os
 import sys
 import json
+import zlib
+import time
 import pandas as pd
 import numpy as np
 from pathlib import Path
-from sentence_transformers import SentenceTransformer
+from functools import partial
 from sklearn.metrics.pairwise import cosine_similarity
+from request_profiler import SlowRequestProfiler
 
 # Paths
 DATA_PATH = Path(__file__).resolve().parent / "civicconnect_govt_schemes_dataset_large.csv"
 META_PATH = Path(__file__).resolve().parent / "scheme_metadata.json"
 EMB_ARRAY_PATH = Path(__file__).resolve().parent / "scheme_embeddings_cache.npy"
 SCHEME_LIST_PATH = Path(__file__).resolve().parent / "scheme_list_cache.json"
+STUB_ENCODER = os.environ.get("CIVIC_STUB_ENCODER", "") not in ("", "0")
+
+# Slow-request profiler (None unless CIVIC_PROFILE_RATE > 0)
+profiler = SlowRequestProfiler.from_env()
 
 # Load dataset
 if not DATA_PATH.exists():
@@ -56,8 +71,20 @@ for entry in df['eligible_schemes']:
 
 scheme_list = sorted(list(scheme_set))
 
+class StubEncoder:
+    """Deterministic offline stand-in for SentenceTransformer.encode (load testing only)."""
+    dim = 384
+
+    def encode(self, text, convert_to_numpy=True):
+        rng = np.random.default_rng(zlib.crc32(text.encode("utf-8")))
+        return rng.standard_normal(self.dim).astype(np.float32)
+
 # Load Sentence-BERT model
-model = SentenceTransformer('paraphrase-MiniLM-L6-v2')
+if STUB_ENCODER:
+    model = StubEncoder()
+else:
+    from sentence_transformers import SentenceTransformer
+    model = SentenceTransformer('paraphrase-MiniLM-L6-v2')
 
 def _build_embeddings():
     emb_dict = {}
@@ -66,7 +93,9 @@ def _build_embeddings():
     return emb_dict
 
 # Embedding caching
-if EMB_ARRAY_PATH.exists() and SCHEME_LIST_PATH.exists():
+if STUB_ENCODER:
+    scheme_embeddings = _build_embeddings()
+elif EMB_ARRAY_PATH.exists() and SCHEME_LIST_PATH.exists():
     try:
         cached_list = json.loads(SCHEME_LIST_PATH.read_text(encoding="utf-8"))
         if cached_list == scheme_list:
@@ -163,11 +192,43 @@ def apply_rule_filters(recommended_schemes, user):
 
 def recommend_schemes(age, category, income, state, top_k=10):
     """Main recommendation function returning strictly eligible schemes."""
+    if profiler is None or not profiler.should_sample():
+        return _recommend_schemes(age, category, income, state, top_k)
+    stages = {}
+    request = {"age": age, "category": category, "annualIncome": income, "state": state, "top_k": top_k}
+    return profiler.run(
+        lambda: _recommend_schemes(age, category, income, state, top_k, stages), request, stages
+    )
+
+def _lap(stages, key, start, **counts):
+    """Record ms since `start` (plus any counts) into `stages`; returns the new start time."""
+    now = time.perf_counter()
+    stages[key] = (now - start) * 1000
+    if counts:
+        stages.update(counts)
+        if "candidates" in counts:
+            c = counts["candidates"]
+            stages["filter_miss_rate"] = 1 - counts["eligible"] / c if c else 0.0
+    return now
+
+def _no_lap(key, start, **counts):
+    """Stand-in for _lap on unprofiled requests: no clock reads, nothing recorded."""
+    return start
+
+def _recommend_schemes(age, category, income, state, top_k=10, stages=None):
+    """Pipeline body; per-stage ms and filter counts go into `stages` when profiling."""
+    if stages is None:
+        lap, t = _no_lap, None
+    else:
+        lap, t = partial(_lap, stages), time.perf_counter()
     # Define BPL as income below threshold (25k) – could refine later with region-specific poverty lines
     is_bpl = income <= 25_000
     user_emb = get_user_embedding(age, category, income, state, is_bpl)
+    t = lap("encode_ms", t)
     ranked = rank_schemes(user_emb, scheme_embeddings, top_k=80)  # broader candidate pool
+    t = lap("rank_ms", t)
     filtered = apply_rule_filters(ranked, (age, category, income, state, is_bpl))
+    t = lap("filter_ms", t, candidates=len(ranked), eligible=len(filtered))
 
     # Deduplicate preserve first occurrence (already sorted by similarity pre-filter)
     seen = set()
@@ -180,22 +241,21 @@ def recommend_schemes(age, category, income, state, top_k=10):
 
     # Re-sort by score after filtering
     dedup.sort(key=lambda x: x[1], reverse=True)
+    lap("dedup_sort_ms", t)
     return dedup[:top_k]
 
-if __name__ == "__main__":
-    # Read user data from stdin (passed from Node.js)
-    input_data = json.loads(sys.stdin.read())
-    
+def handle_request(input_data):
+    """Map one JSON profile (Node contract) to the JSON response payload."""
     age = input_data['age']
     category = input_data['category']
     income = input_data['annualIncome']
     state = input_data['state']
-    
+
     # Get recommendations
     recommendations = recommend_schemes(age, category, income, state, top_k=15)
-    
+
     # Format output
-    result = {
+    return {
         'schemes': [
             {
                 'name': scheme,
@@ -205,6 +265,21 @@ if __name__ == "__main__":
             for scheme, score in recommendations
         ]
     }
-    
-    # Output as JSON
-    print(json.dumps(result))
+
+if __name__ == "__main__":
+    if "--stream" in sys.argv:
+        # Long-lived worker: one request per line, keep serving after bad input
+        for line in sys.stdin:
+            if not line.strip():
+                continue
+            try:
+                result = handle_request(json.loads(line))
+            except Exception as exc:
+                result = {'error': str(exc)}
+            print(json.dumps(result), flush=True)
+    else:
+        # Read user data from stdin (passed from Node.js)
+        input_data = json.loads(sys.stdin.read())
+
+        # Output as JSON
+        print(json.dumps(handle_request(input_data)))
@@ -0,0 +1,188 @@
+"""Opt-in slow-request profiler for the recommendation pipeline.
+
+A configurable fraction of requests runs under cProfile (or a lightweight
+stack sampler). If the request takes longer than the latency threshold, the
+profile is kept and written together with the input profile, the per-stage
+breakdown and GC pauses to a rotating directory; fast requests are discarded.
+
+Configured from the environment (disabled unless CIVIC_PROFILE_RATE > 0):
+- CIVIC_PROFILE_RATE: fraction of requests to profile (0-1)
+- CIVIC_PROFILE_THRESHOLD_MS: keep profiles of requests slower than this (default 500)
+- CIVIC_PROFILE_DIR: output directory (default backend/profiles)
+- CIVIC_PROFILE_KEEP: number of slow requests retained, oldest deleted first (default 50)
+- CIVIC_PROFILE_MODE: "cprofile" (default) or "sampler"
+- CIVIC_PROFILE_INTERVAL_MS: sampler interval (default 1)
+
+When disabled, from_env() returns None and callers skip profiling entirely.
+"""
+from __future__ import annotations
+import cProfile
+import gc
+import io
+import json
+import os
+import pstats
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+DEFAULT_DIR = Path(__file__).resolve().parent / "profiles"
+# Stems written by _save (e.g. 20261019-040310-390293411-12ms); rotation never touches other files
+ARTIFACT_STEM_RE = re.compile(r"^\d{8}-\d{6}-\d{9}-\d+ms$")
+ARTIFACT_SUFFIXES = (".json", ".prof", ".txt", ".folded")
+
+
+class StackSampler:
+    """Samples the calling thread's stack every `interval` seconds from a daemon thread."""
+
+    def __init__(self, interval=0.001):
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = None
+        self._target = None
+
+    def start(self):
+        self._target = threading.get_ident()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target)
+            if frame is None:
+                continue
+            # Walk frames directly: no linecache lookups while holding the GIL
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                frame = frame.f_back
+            self.stacks[";".join(reversed(names))] += 1
+
+    def dump(self, path):
+        # Collapsed-stack format, loadable by flamegraph.pl / speedscope
+        lines = [f"{stack} {count}" for stack, count in self.stacks.most_common()]
+        Path(path).write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+class SlowRequestProfiler:
+    def __init__(self, sample_rate, threshold_ms=500.0, out_dir=DEFAULT_DIR, keep=50,
+                 mode="cprofile", interval_ms=1.0):
+        if mode not in ("cprofile", "sampler"):
+            raise ValueError(f"Unknown profiler mode: {mode}")
+        self.sample_rate = sample_rate
+        self.threshold_ms = threshold_ms
+        self.out_dir = Path(out_dir)
+        self.keep = keep
+        self.mode = mode
+        self.interval_ms = interval_ms
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, environ=os.environ):
+        """Profiler from CIVIC_PROFILE_* settings, or None if disabled or misconfigured.
+
+        Bad values only disable profiling (with a warning on stderr): an opt-in
+        diagnostic must never break the API.
+        """
+        try:
+            rate = float(environ.get("CIVIC_PROFILE_RATE", "0") or 0)
+            if rate <= 0:
+                return None
+            return cls(
+                sample_rate=min(rate, 1.0),
+                threshold_ms=float(environ.get("CIVIC_PROFILE_THRESHOLD_MS", "500")),
+                out_dir=environ.get("CIVIC_PROFILE_DIR", str(DEFAULT_DIR)),
+                keep=int(environ.get("CIVIC_PROFILE_KEEP", "50")),
+                mode=environ.get("CIVIC_PROFILE_MODE", "cprofile"),
+                interval_ms=float(environ.get("CIVIC_PROFILE_INTERVAL_MS", "1")),
+            )
+        except ValueError as exc:
+            print(f"request_profiler: invalid CIVIC_PROFILE_* setting ({exc}); profiling disabled",
+                  file=sys.stderr)
+            return None
+
+    def should_sample(self):
+        return random.random() < self.sample_rate
+
+    def run(self, fn, request, stages):
+        """Call fn() under the profiler; persist artifacts if it was slow.
+
+        request: the input profile (JSON-serialisable), stages: dict fn fills
+        with its per-stage breakdown.
+        """
+        gc_pauses = []
+        gc_start = {}
+
+        def on_gc(phase, info):
+            if phase == "start":
+                gc_start["t"] = time.perf_counter()
+            elif "t" in gc_start:
+                gc_pauses.append({"generation": info["generation"],
+                                  "ms": (time.perf_counter() - gc_start.pop("t")) * 1000})
+
+        profiler = cProfile.Profile() if self.mode == "cprofile" else StackSampler(self.interval_ms / 1000)
+        gc.callbacks.append(on_gc)
+        start = time.perf_counter()
+        if self.mode == "cprofile":
+            profiler.enable()
+        else:
+            profiler.start()
+        try:
+            return fn()
+        finally:
+            if self.mode == "cprofile":
+                profiler.disable()
+            else:
+                profiler.stop()
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            gc.callbacks.remove(on_gc)
+            if elapsed_ms >= self.threshold_ms:
+                try:
+                    self._save(profiler, request, stages, gc_pauses, elapsed_ms)
+                except OSError as exc:
+                    print(f"request_profiler: could not save profile: {exc}", file=sys.stderr)
+
+    def _save(self, profiler, request, stages, gc_pauses, elapsed_ms):
+        with self._lock:
+            self.out_dir.mkdir(parents=True, exist_ok=True)
+            now_ns = time.time_ns()
+            stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(now_ns // 1_000_000_000))
+            stem = f"{stamp}-{now_ns % 1_000_000_000:09d}-{elapsed_ms:.0f}ms"
+            summary = {
+                "elapsed_ms": elapsed_ms,
+                "threshold_ms": self.threshold_ms,
+                "request": request,
+                "stages": stages,
+                "gc_pauses": gc_pauses,
+                "gc_total_ms": sum(p["ms"] for p in gc_pauses),
+                "mode": self.mode,
+            }
+            if self.mode == "cprofile":
+                profiler.dump_stats(self.out_dir / f"{stem}.prof")
+                text = io.StringIO()
+                pstats.Stats(profiler, stream=text).sort_stats("cumulative").print_stats(30)
+                (self.out_dir / f"{stem}.txt").write_text(text.getvalue(), encoding="utf-8")
+            else:
+                profiler.dump(self.out_dir / f"{stem}.folded")
+            (self.out_dir / f"{stem}.json").write_text(json.dumps(summary, indent=2, default=str),
+                                                       encoding="utf-8")
+            self._rotate()
+
+    def _rotate(self):
+        # One .json per kept request; remove every artifact of the oldest ones.
+        # Only our own stems count, so a shared CIVIC_PROFILE_DIR is left alone.
+        summaries = sorted(p for p in self.out_dir.glob("*.json") if ARTIFACT_STEM_RE.match(p.stem))
+        for old in summaries[:max(len(summaries) - self.keep, 0)]:
+            for suffix in ARTIFACT_SUFFIXES:
+                (self.out_dir / f"{old.stem}{suffix}").unlink(missing_ok=True)
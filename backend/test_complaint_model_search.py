@@ -0,0 +1,58 @@
+"""Tests for the complaint model search ranking helpers."""
+import pytest
+
+pytest.importorskip("sklearn")
+from complaint_model_search import expand_grid, fastest_meeting, mark_pareto, rank_results
+
+
+def _row(name, acc, lat, size):
+    return {"name": name, "cv_accuracy": acc, "latency_us": lat, "model_bytes": size}
+
+
+def test_expand_grid_covers_every_combination():
+    configs = expand_grid({"b": [1, 2], "a": ["x", "y", "z"]})
+    assert len(configs) == 6
+    assert {"a": "x", "b": 1} in configs and {"a": "z", "b": 2} in configs
+    assert len({tuple(sorted(c.items())) for c in configs}) == 6
+
+
+def test_mark_pareto_flags_only_non_dominated_rows():
+    rows = [
+        _row("accurate", 0.95, 40.0, 900),
+        _row("fast", 0.90, 10.0, 900),
+        _row("small", 0.90, 20.0, 100),
+        _row("dominated", 0.89, 30.0, 950),   # worse than "fast" on every axis
+        _row("tied_worse", 0.90, 10.0, 1000),  # equal to "fast" except bigger
+    ]
+    flags = {r["name"]: r["pareto"] for r in mark_pareto(rows)}
+    assert flags == {"accurate": True, "fast": True, "small": True,
+                     "dominated": False, "tied_worse": False}
+
+
+def test_identical_rows_do_not_dominate_each_other():
+    rows = mark_pareto([_row("a", 0.9, 10.0, 100), _row("b", 0.9, 10.0, 100)])
+    assert all(r["pareto"] for r in rows)
+
+
+def test_rank_results_front_by_latency_then_dominated_by_accuracy():
+    rows = [
+        _row("dominated_low", 0.80, 50.0, 950),
+        _row("accurate", 0.95, 40.0, 900),
+        _row("dominated_high", 0.89, 45.0, 950),
+        _row("fast", 0.90, 10.0, 900),
+        _row("small", 0.90, 20.0, 100),
+    ]
+    ranked = [r["name"] for r in rank_results(rows)]
+    assert ranked == ["fast", "small", "accurate", "dominated_high", "dominated_low"]
+
+
+def test_fastest_meeting_picks_fastest_above_bar():
+    rows = [
+        _row("accurate", 0.95, 40.0, 900),
+        _row("fast", 0.90, 10.0, 900),
+        _row("fast_small", 0.91, 10.0, 100),
+        _row("too_weak", 0.70, 1.0, 10),
+    ]
+    assert fastest_meeting(rows, 0.9)["name"] == "fast_small"
+    assert fastest_meeting(rows, 0.95)["name"] == "accurate"
+    assert fastest_meeting(rows, 0.99) is None
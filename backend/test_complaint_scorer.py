@@ -0,0 +1,116 @@
+"""Parity tests: FastComplaintScorer must predict exactly what the sklearn bundle predicts."""
+import numpy as np
+import pytest
+
+pytest.importorskip("sklearn")
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import LabelEncoder
+
+from complaint_scorer import FastComplaintScorer, clean_text
+
+
+TRAIN = [
+    ("Water logging in the streets after heavy rains", "Drainage"),
+    ("Drain overflow and sewage water on the road", "Drainage"),
+    ("Blocked drain near the market, water everywhere", "Drainage"),
+    ("Lawyer asking for bribes at the district court", "Corruption"),
+    ("Clerk demanded a bribe to process my file", "Corruption"),
+    ("Officer took money to issue the certificate", "Corruption"),
+    ("Huge pothole on MG Road damaging vehicles", "Roads"),
+    ("Road surface broken, potholes everywhere", "Roads"),
+    ("Street road repair pending for months", "Roads"),
+    ("Illegal gathering in residential premises at night", "Public Order"),
+    ("Loud crowd and fights in our colony", "Public Order"),
+    ("Harassment complaint filed but no police action", "Public Order"),
+]
+
+EDGE_CASES = [
+    "the and of is was it",                               # only stop words
+    "zzzz qqqq xylophone",                                # out of vocabulary
+    "",                                                   # empty
+    "See http://example.com/pothole www.city.gov road 42 potholes!!",  # urls + digits
+    "bribe bribe bribe bribe court",                      # tf > 1
+    "drain drain water water water road",                 # tf > 1 across classes
+    "Pothole-2024: road_broken & drain#blocked",          # punctuation splits tokens
+]
+
+
+def _fit_bundle(samples, **vectorizer_kwargs):
+    texts = [clean_text(t) for t, _ in samples]
+    label_encoder = LabelEncoder()
+    y = label_encoder.fit_transform([label for _, label in samples])
+    vectorizer = TfidfVectorizer(stop_words="english", **vectorizer_kwargs)
+    clf = LogisticRegression(max_iter=1000)
+    clf.fit(vectorizer.fit_transform(texts), y)
+    return {"vectorizer": vectorizer, "classifier": clf, "label_encoder": label_encoder}
+
+
+def _sklearn_predict(bundle, texts):
+    X = bundle["vectorizer"].transform([clean_text(t) for t in texts])
+    return bundle["label_encoder"].inverse_transform(bundle["classifier"].predict(X))
+
+
+def _sklearn_decision(bundle, texts):
+    X = bundle["vectorizer"].transform([clean_text(t) for t in texts])
+    return bundle["classifier"].decision_function(X)
+
+
+@pytest.mark.parametrize("ngram_range", [(1, 1), (1, 2)])
+def test_multiclass_parity(ngram_range):
+    bundle = _fit_bundle(TRAIN, ngram_range=ngram_range)
+    scorer = FastComplaintScorer.from_bundle(bundle)
+    texts = [t for t, _ in TRAIN] + EDGE_CASES
+
+    assert list(scorer.predict(texts)) == list(_sklearn_predict(bundle, texts))
+    expected = _sklearn_decision(bundle, texts)
+    got = np.array([scorer.decision_function(t) for t in texts])
+    np.testing.assert_allclose(got, expected, rtol=1e-9, atol=1e-12)
+
+
+def test_binary_parity():
+    samples = [(t, label) for t, label in TRAIN if label in ("Drainage", "Roads")]
+    bundle = _fit_bundle(samples, ngram_range=(1, 2))
+    scorer = FastComplaintScorer.from_bundle(bundle)
+    texts = [t for t, _ in samples] + EDGE_CASES
+
+    assert list(scorer.predict(texts)) == list(_sklearn_predict(bundle, texts))
+
+
+def test_stop_word_and_oov_text_scores_intercept_only():
+    bundle = _fit_bundle(TRAIN, ngram_range=(1, 2))
+    scorer = FastComplaintScorer.from_bundle(bundle)
+
+    for text in ("the and of is", "zzzz qqqq", ""):
+        ids, _ = scorer.features(text)
+        assert len(ids) == 0
+        np.testing.assert_allclose(scorer.decision_function(text), scorer.intercept)
+
+
+def test_save_load_roundtrip(tmp_path):
+    bundle = _fit_bundle(TRAIN, ngram_range=(1, 2))
+    scorer = FastComplaintScorer.from_bundle(bundle)
+    scorer.save(tmp_path / "scorer")
+    loaded = FastComplaintScorer.load(tmp_path / "scorer")
+
+    texts = [t for t, _ in TRAIN] + EDGE_CASES
+    assert list(loaded.predict(texts)) == list(_sklearn_predict(bundle, texts))
+    assert loaded.n_features == scorer.n_features
+
+
+def test_prune_shrinks_features_and_roundtrips(tmp_path):
+    bundle = _fit_bundle(TRAIN, ngram_range=(1, 2))
+    scorer = FastComplaintScorer.from_bundle(bundle)
+    pruned = scorer.prune(10)
+
+    assert pruned.n_features == 10
+    assert len(pruned.table) == 10
+    pruned.save(tmp_path / "pruned")
+    loaded = FastComplaintScorer.load(tmp_path / "pruned")
+    texts = [t for t, _ in TRAIN]
+    assert list(loaded.predict(texts)) == list(pruned.predict(texts))
+
+
+def test_clean_text_strips_urls_digits_and_punctuation():
+    text = "See http://x.com/a WWW.City.gov  Road-42,\tpothole!!"
+    assert clean_text(text) == "see road pothole"
@@ -0,0 +1,126 @@
+"""Tests for the recommend_api load-testing harness."""
+import json
+import math
+import sys
+import time
+
+import pytest
+
+import load_test_recommend as lt
+
+
+class FakeTarget:
+    """Callable target: sleeps `delay` seconds and fails for profiles marked 'fail'."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = 0
+
+    def __call__(self, profile):
+        self.calls += 1
+        time.sleep(self.delay)
+        if profile.get("fail"):
+            raise RuntimeError("boom")
+
+
+def test_percentile_interpolates():
+    values = [10.0, 20.0, 30.0, 40.0]
+    assert lt.percentile(values, 0) == 10.0
+    assert lt.percentile(values, 50) == 25.0
+    assert lt.percentile(values, 100) == 40.0
+    assert math.isnan(lt.percentile([], 50))
+
+
+def test_summarize_counts_successes_for_throughput_and_errors_for_rate():
+    summary = lt.summarize([0.1, 0.2, 0.3], ["RuntimeError('boom')"], 2.0, [100.0, 50.0])
+    assert summary["requests"] == 4
+    assert summary["throughput_rps"] == pytest.approx(1.5)
+    assert summary["error_rate"] == pytest.approx(0.25)
+    assert summary["p50_ms"] == pytest.approx(200.0)
+    assert summary["peak_rss_mb"] == pytest.approx(150.0)
+    assert summary["peak_rss_per_worker_mb"] == [100.0, 50.0]
+
+
+def test_summarize_without_rss_reports_nan():
+    summary = lt.summarize([], ["err"], 1.0, None)
+    assert math.isnan(summary["peak_rss_mb"])
+    assert summary["error_rate"] == 1.0
+    assert summary["throughput_rps"] == 0.0
+
+
+def test_closed_loop_issues_every_request_and_records_errors():
+    target = FakeTarget()
+    profiles = [{"age": 30}, {"age": 40, "fail": True}]
+    latencies, errors, _ = lt.run_load(target, profiles, 50, concurrency=4, seed=1)
+    assert target.calls == 50
+    assert len(latencies) + len(errors) == 50
+    assert errors and all("boom" in e for e in errors)
+
+
+def test_open_loop_latency_includes_queueing_from_scheduled_arrival():
+    # 10 arrivals at ~1000 req/s into a single 20 ms server: the last one queues behind the rest
+    target = FakeTarget(delay=0.02)
+    latencies, errors, _ = lt.run_load(target, [{"age": 30}], 10, concurrency=1, rate=1000, seed=0)
+    assert not errors
+    assert max(latencies) >= 0.15
+    assert min(latencies) < 0.1
+
+
+FAKE_WORKER = """
+import json, sys, time
+for line in sys.stdin:
+    profile = json.loads(line)
+    if profile.get("hang"):
+        time.sleep(60)
+    if profile.get("die"):
+        sys.exit(3)
+    print(json.dumps({"schemes": []}), flush=True)
+"""
+
+
+@pytest.fixture
+def fake_api(tmp_path, monkeypatch):
+    script = tmp_path / "fake_api.py"
+    script.write_text(FAKE_WORKER)
+    monkeypatch.setattr(lt, "API_PATH", script)
+    return script
+
+
+@pytest.mark.parametrize("bad_profile, exc", [({"hang": True}, TimeoutError),
+                                               ({"die": True}, RuntimeError)])
+def test_stream_target_replaces_wedged_or_dead_worker(fake_api, bad_profile, exc):
+    target = lt.StreamTarget(sys.executable, False, workers=1, timeout=0.5)
+    try:
+        target({"age": 30})
+        old = target.workers[0]
+        with pytest.raises(exc):
+            target(bad_profile)
+        assert target.workers[0] is not old
+        assert old.proc.poll() is not None
+        target({"age": 31})  # the replacement serves the next request
+    finally:
+        target.close()
+
+
+def test_stream_target_with_stub_encoder_end_to_end():
+    for module in ("numpy", "pandas", "sklearn"):
+        pytest.importorskip(module)
+    target = lt.StreamTarget(sys.executable, True, workers=1, timeout=120)
+    try:
+        target.warm_up({"age": 65, "category": "SC", "annualIncome": 20000, "state": "Bihar"})
+        worker = target.workers[0]
+        with pytest.raises(RuntimeError):
+            target({"age": 30})  # missing keys -> {"error": ...}; worker stays usable
+        assert target.workers[0] is worker
+        target({"age": 25, "category": "OBC", "annualIncome": 60000, "state": "Bihar"})
+        rss = target.peak_rss()
+        assert len(rss) == 1 and (rss[0] > 0 or math.isnan(rss[0]))
+    finally:
+        target.close()
+
+
+def test_load_profiles_follow_dataset_schema():
+    profiles = lt.load_profiles()
+    assert profiles
+    assert set(profiles[0]) == {"age", "category", "annualIncome", "state"}
+    json.dumps(profiles[:10])
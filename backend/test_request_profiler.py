@@ -0,0 +1,116 @@
+"""Tests for the opt-in slow-request profiler."""
+import json
+import time
+
+import pytest
+
+from request_profiler import SlowRequestProfiler
+
+
+def _slow(ms, stages):
+    def fn():
+        stages["work_ms"] = ms
+        time.sleep(ms / 1000)
+        return "done"
+    return fn
+
+
+def _stems(directory):
+    return sorted({p.stem for p in directory.iterdir()})
+
+
+def test_from_env_disabled_by_default():
+    assert SlowRequestProfiler.from_env({}) is None
+    assert SlowRequestProfiler.from_env({"CIVIC_PROFILE_RATE": "0"}) is None
+
+
+@pytest.mark.parametrize("env", [
+    {"CIVIC_PROFILE_RATE": "abc"},
+    {"CIVIC_PROFILE_RATE": "0.5", "CIVIC_PROFILE_KEEP": "ten"},
+    {"CIVIC_PROFILE_RATE": "0.5", "CIVIC_PROFILE_MODE": "perf"},
+])
+def test_from_env_invalid_values_disable_profiling(env, capsys):
+    assert SlowRequestProfiler.from_env(env) is None
+    assert "profiling disabled" in capsys.readouterr().err
+
+
+def test_threshold_keeps_slow_and_discards_fast(tmp_path):
+    profiler = SlowRequestProfiler(sample_rate=1.0, threshold_ms=30, out_dir=tmp_path)
+
+    assert profiler.run(_slow(0, {}), {"age": 30}, {}) == "done"
+    assert list(tmp_path.iterdir()) == []
+
+    stages = {}
+    assert profiler.run(_slow(50, stages), {"age": 61}, stages) == "done"
+    (stem,) = _stems(tmp_path)
+    assert {p.suffix for p in tmp_path.iterdir()} == {".json", ".prof", ".txt"}
+    summary = json.loads((tmp_path / f"{stem}.json").read_text())
+    assert summary["request"] == {"age": 61}
+    assert summary["stages"] == {"work_ms": 50}
+    assert summary["elapsed_ms"] >= 30
+    assert "gc_pauses" in summary
+
+
+def test_rotation_removes_all_artifacts_of_oldest(tmp_path):
+    profiler = SlowRequestProfiler(sample_rate=1.0, threshold_ms=0, out_dir=tmp_path, keep=2)
+
+    for age in range(4):
+        profiler.run(_slow(1, {}), {"age": age}, {})
+
+    stems = _stems(tmp_path)
+    assert len(stems) == 2
+    assert len(list(tmp_path.iterdir())) == 2 * 3
+    ages = [json.loads((tmp_path / f"{s}.json").read_text())["request"]["age"] for s in stems]
+    assert ages == [2, 3]
+
+
+def test_sampler_mode_writes_folded_stacks(tmp_path):
+    profiler = SlowRequestProfiler(sample_rate=1.0, threshold_ms=0, out_dir=tmp_path,
+                                   mode="sampler", interval_ms=1)
+
+    profiler.run(_slow(50, {}), {"age": 40}, {})
+
+    (stem,) = _stems(tmp_path)
+    assert {p.suffix for p in tmp_path.iterdir()} == {".json", ".folded"}
+    lines = (tmp_path / f"{stem}.folded").read_text().splitlines()
+    assert lines
+    stack, count = lines[0].rsplit(" ", 1)
+    assert "fn (test_request_profiler.py:" in stack
+    assert int(count) > 0
+
+
+def test_rotation_ignores_foreign_files_in_shared_dir(tmp_path):
+    foreign = ["scheme_metadata.json", "scheme_metadata.txt", "0-config.json",
+               "2025-01-01.json", "2025-01-01.prof"]
+    for name in foreign:
+        (tmp_path / name).write_text("{}")
+    profiler = SlowRequestProfiler(sample_rate=1.0, threshold_ms=0, out_dir=tmp_path, keep=1)
+
+    for age in range(3):
+        profiler.run(_slow(1, {}), {"age": age}, {})
+
+    for name in foreign:
+        assert (tmp_path / name).exists(), name
+    ours = [s for s in _stems(tmp_path) if s.endswith("ms")]
+    assert len(ours) == 1
+    assert json.loads((tmp_path / f"{ours[0]}.json").read_text())["request"] == {"age": 2}
+
+
+def test_recommend_pipeline_stages_only_when_profiled(monkeypatch):
+    for module in ("numpy", "pandas", "sklearn"):
+        pytest.importorskip(module)
+    monkeypatch.setenv("CIVIC_STUB_ENCODER", "1")
+    monkeypatch.delenv("CIVIC_PROFILE_RATE", raising=False)
+    import importlib
+    import recommend_api
+    recommend_api = importlib.reload(recommend_api)
+    assert recommend_api.profiler is None
+
+    plain = recommend_api._recommend_schemes(65, "SC", 20000, "Bihar", 10)
+    stages = {}
+    timed = recommend_api._recommend_schemes(65, "SC", 20000, "Bihar", 10, stages)
+
+    assert plain == timed
+    assert {"encode_ms", "rank_ms", "filter_ms", "dedup_sort_ms",
+            "candidates", "eligible", "filter_miss_rate"} <= set(stages)
+    assert 0.0 <= stages["filter_miss_rate"] <= 1.0